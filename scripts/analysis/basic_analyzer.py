@@ -1,7 +1,8 @@
 """基礎除息分析器 - v2.0 更新版（使用新配置系統）"""
 
-from datetime import datetime, date
-from typing import List, Dict, Any
+import numpy as np
+from datetime import date
+from typing import List, Dict, Any, Tuple
 
 # 使用新的配置系統
 from config import ETF_INFO
@@ -24,6 +25,35 @@ class BasicDividendAnalyzer:
             print(f"⚠️ 除息日程載入失敗: {e}")
             # 使用緊急備用日程
             self.dividend_calendar = self._get_emergency_schedule()
+        
+        # 載入時一次解析所有日期為序數（ordinal），天數差直接以整數相減
+        self._calendar_entries = self._parse_dividend_calendar(self.dividend_calendar)
+        
+        # 攤平為陣列，機會掃描以向量化整數運算完成
+        self._calendar_etfs = []
+        self._calendar_date_strs = []
+        div_ordinals = []
+        for etf, entries in self._calendar_entries.items():
+            for div_date_str, div_ordinal in entries:
+                self._calendar_etfs.append(etf)
+                self._calendar_date_strs.append(div_date_str)
+                div_ordinals.append(div_ordinal)
+        self._calendar_ordinal_array = np.array(div_ordinals, dtype=np.int64)
+    
+    @staticmethod
+    def _parse_dividend_calendar(calendar: Dict[str, List[str]]) -> Dict[str, List[Tuple[str, int]]]:
+        """將除息日程解析為 (日期字串, 日期序數) 配對，略過格式錯誤的日期"""
+        parsed = {}
+        
+        for etf, dividend_dates in calendar.items():
+            parsed[etf] = []
+            for div_date_str in dividend_dates:
+                try:
+                    parsed[etf].append((div_date_str, date.fromisoformat(div_date_str).toordinal()))
+                except (TypeError, ValueError) as e:
+                    print(f"⚠️ 日期格式錯誤 {etf} {div_date_str}: {e}")
+        
+        return parsed
     
     def _get_emergency_schedule(self) -> Dict[str, List[str]]:
         """緊急備用日程"""
@@ -38,49 +68,44 @@ class BasicDividendAnalyzer:
     
     def find_dividend_opportunities(self) -> List[Dict[str, Any]]:
         """尋找配息機會"""
-        today = date.today()
+        today_ordinal = date.today().toordinal()
         opportunities = []
         
-        for etf, dividend_dates in self.dividend_calendar.items():
-            for div_date_str in dividend_dates:
-                try:
-                    div_date = datetime.strptime(div_date_str, '%Y-%m-%d').date()
-                    
-                    # 買進機會（除息後1-7天）
-                    days_after = (today - div_date).days
-                    if 1 <= days_after <= 7:
-                        opportunities.append({
-                            'etf': etf,
-                            'action': 'BUY',
-                            'dividend_date': div_date_str,
-                            'days_after': days_after,
-                            'priority': self.etf_info.get(etf, {}).get('priority', 99),
-                            'reason': f'除息後第{days_after}天，建議買進',
-                            'confidence': 'high' if days_after <= 3 else 'medium',
-                            'expected_return': self.etf_info.get(etf, {}).get('expected_return', 0),
-                            'success_rate': self.etf_info.get(etf, {}).get('success_rate', 0.5)
-                        })
-                    
-                    # 清倉提醒（除息前0-3天）
-                    days_to = (div_date - today).days
-                    if 0 <= days_to <= 3:
-                        opportunities.append({
-                            'etf': etf,
-                            'action': 'PREPARE',
-                            'dividend_date': div_date_str,
-                            'days_to_dividend': days_to,
-                            'priority': self.etf_info.get(etf, {}).get('priority', 99),
-                            'reason': f'{days_to}天後除息，準備清倉' if days_to > 0 else '今日除息，立即清倉',
-                            'confidence': 'high',
-                            'urgency': 'high' if days_to <= 1 else 'medium'
-                        })
-                        
-                except ValueError as e:
-                    print(f"⚠️ 日期格式錯誤 {etf} {div_date_str}: {e}")
-                    continue
-                except Exception as e:
-                    print(f"❌ 處理 {etf} {div_date_str} 時發生錯誤: {e}")
-                    continue
+        # 一次計算所有除息日距今天數，只對落在窗口內的日期組裝結果
+        days_after_all = today_ordinal - self._calendar_ordinal_array
+        buy_mask = (days_after_all >= 1) & (days_after_all <= 7)      # 買進機會（除息後1-7天）
+        prepare_mask = (days_after_all >= -3) & (days_after_all <= 0)  # 清倉提醒（除息前0-3天）
+        
+        for idx in np.flatnonzero(buy_mask | prepare_mask):
+            etf = self._calendar_etfs[idx]
+            div_date_str = self._calendar_date_strs[idx]
+            etf_info = self.etf_info.get(etf, {})
+            
+            if buy_mask[idx]:
+                days_after = int(days_after_all[idx])
+                opportunities.append({
+                    'etf': etf,
+                    'action': 'BUY',
+                    'dividend_date': div_date_str,
+                    'days_after': days_after,
+                    'priority': etf_info.get('priority', 99),
+                    'reason': f'除息後第{days_after}天，建議買進',
+                    'confidence': 'high' if days_after <= 3 else 'medium',
+                    'expected_return': etf_info.get('expected_return', 0),
+                    'success_rate': etf_info.get('success_rate', 0.5)
+                })
+            else:
+                days_to = -int(days_after_all[idx])
+                opportunities.append({
+                    'etf': etf,
+                    'action': 'PREPARE',
+                    'dividend_date': div_date_str,
+                    'days_to_dividend': days_to,
+                    'priority': etf_info.get('priority', 99),
+                    'reason': f'{days_to}天後除息，準備清倉' if days_to > 0 else '今日除息，立即清倉',
+                    'confidence': 'high',
+                    'urgency': 'high' if days_to <= 1 else 'medium'
+                })
         
         # 按優先級排序
         opportunities.sort(key=lambda x: (x.get('priority', 99), x.get('days_after', 99)))
@@ -90,12 +115,11 @@ class BasicDividendAnalyzer:
     
     def get_next_dividend_dates(self, etf_code: str, limit: int = 3) -> List[str]:
         """獲取指定ETF的下幾個除息日期"""
-        today = date.today()
-        etf_dates = self.dividend_calendar.get(etf_code, [])
+        today_ordinal = date.today().toordinal()
         
         future_dates = [
-            date_str for date_str in etf_dates
-            if datetime.strptime(date_str, '%Y-%m-%d').date() > today
+            date_str for date_str, div_ordinal in self._calendar_entries.get(etf_code, [])
+            if div_ordinal > today_ordinal
         ]
         
         return future_dates[:limit]
@@ -105,24 +129,19 @@ class BasicDividendAnalyzer:
         if target_date is None:
             target_date = date.today()
         
-        etf_dates = self.dividend_calendar.get(etf_code, [])
-        
-        for div_date_str in etf_dates:
-            try:
-                div_date = datetime.strptime(div_date_str, '%Y-%m-%d').date()
-                days_after = (target_date - div_date).days
-                
-                if 1 <= days_after <= 7:
-                    return {
-                        'in_buy_window': True,
-                        'dividend_date': div_date_str,
-                        'days_after': days_after,
-                        'window_type': '1-7天買進窗口',
-                        'confidence': 'high' if days_after <= 3 else 'medium'
-                    }
-                    
-            except ValueError:
-                continue
+        target_ordinal = target_date.toordinal()
+        
+        for div_date_str, div_ordinal in self._calendar_entries.get(etf_code, []):
+            days_after = target_ordinal - div_ordinal
+            
+            if 1 <= days_after <= 7:
+                return {
+                    'in_buy_window': True,
+                    'dividend_date': div_date_str,
+                    'days_after': days_after,
+                    'window_type': '1-7天買進窗口',
+                    'confidence': 'high' if days_after <= 3 else 'medium'
+                }
         
         return {
             'in_buy_window': False,
@@ -47,6 +47,7 @@ def main():
     optional_modules = [
         ("lxml", "XML/HTML解析庫"),
         ("bs4", "BeautifulSoup4網頁解析庫"),
+        ("orjson", "高速JSON序列化庫"),
     ]
     
     optional_results = []
@@ -68,6 +69,7 @@ def main():
         ("config.base_dividend", "基礎除息配置"),
         ("core.config_manager", "配置管理器"),
         ("core.firebase_client", "Firebase客戶端"),
+        ("core.http_session", "HTTP連線池工具"),
         ("core.data_collector", "數據收集器"),
         ("core.etf_data_parser", "數據解析器"),
     ]
@@ -123,7 +125,7 @@ def main():
     
     if optional_passed < optional_total:
         print("⚠️ 可選依賴缺失，建議執行:")
-        print("   pip install lxml beautifulsoup4")
+        print("   pip install lxml beautifulsoup4 orjson")
     
     if project_passed < project_total:
         print("⚠️ 專案模組問題，請檢查檔案是否存在且格式正確")
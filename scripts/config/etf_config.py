@@ -65,6 +65,17 @@ CONFIG_SYSTEM = {
     'update_date': '2025-07-22'
 }
 
+def _import_config_manager():
+    """載入配置管理器模組（三個對外API共用，模組只會被匯入一次）"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    core_dir = os.path.join(os.path.dirname(current_dir), "core")
+    
+    if core_dir not in sys.path:
+        sys.path.insert(0, core_dir)
+    
+    import config_manager
+    return config_manager
+
 def get_dividend_schedule() -> Dict[str, List[str]]:
     """
     獲取當前除息日程表（新版API）
@@ -79,14 +90,7 @@ def get_dividend_schedule() -> Dict[str, List[str]]:
     """
     try:
         # 嘗試使用新的配置管理器
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        core_dir = os.path.join(os.path.dirname(current_dir), "core")
-        
-        if core_dir not in sys.path:
-            sys.path.insert(0, core_dir)
-        
-        from config_manager import get_dividend_schedule as get_schedule
-        return get_schedule()
+        return _import_config_manager().get_dividend_schedule()
         
     except ImportError:
         print("⚠️ 新配置系統不可用，使用緊急備用配置")
@@ -108,14 +112,7 @@ def update_dividend_dates(etf_code: str, dates: List[str], source: str = "manual
         bool: 更新是否成功
     """
     try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        core_dir = os.path.join(os.path.dirname(current_dir), "core")
-        
-        if core_dir not in sys.path:
-            sys.path.insert(0, core_dir)
-        
-        from config_manager import update_dividend_dates as update_dates
-        return update_dates(etf_code, dates, source)
+        return _import_config_manager().update_dividend_dates(etf_code, dates, source)
         
     except ImportError:
         print("⚠️ 新配置系統不可用，無法更新")
@@ -169,14 +166,7 @@ def get_dividend_calendar() -> Dict[str, List[str]]:
 def get_config_status():
     """顯示當前配置系統狀態"""
     try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        core_dir = os.path.join(os.path.dirname(current_dir), "core")
-        
-        if core_dir not in sys.path:
-            sys.path.insert(0, core_dir)
-        
-        from config_manager import get_config_info
-        get_config_info()
+        _import_config_manager().get_config_info()
         
     except Exception as e:
         print(f"❌ 無法顯示配置狀態: {e}")
@@ -29,6 +29,9 @@ class DividendConfigManager:
         self.config_dir = os.path.join(os.path.dirname(self.current_dir), "config")
         self.dynamic_config_path = os.path.join(self.config_dir, "dynamic_dividend.json")
         
+        # 動態配置快取：((mtime_ns, size), config)，檔案未變更時不重新解析
+        self._dynamic_config_cache = None
+        
         # 確保配置目錄存在
         os.makedirs(self.config_dir, exist_ok=True)
         
@@ -123,14 +126,20 @@ class DividendConfigManager:
         return schedule
     
     def _load_dynamic_config(self) -> Dict:
-        """載入動態配置檔案"""
+        """載入動態配置檔案（檔案未變更時使用快取）"""
         try:
             if os.path.exists(self.dynamic_config_path):
+                file_key = self._get_file_key()
+                if self._dynamic_config_cache and self._dynamic_config_cache[0] == file_key:
+                    return self._dynamic_config_cache[1]
+                
                 with open(self.dynamic_config_path, 'r', encoding='utf-8') as f:
                     config = json.load(f)
                     print(f"   📄 動態配置版本: {config.get('config_version', 'Unknown')}")
                     print(f"   ⏰ 最後更新: {config.get('last_updated', 'Unknown')}")
-                    return config
+                
+                self._dynamic_config_cache = (file_key, config)
+                return config
             else:
                 print("   ⚠️ 動態配置檔案不存在，創建預設配置")
                 return self._create_default_dynamic_config()
@@ -138,20 +147,42 @@ class DividendConfigManager:
             print(f"   ❌ 載入動態配置失敗: {e}")
             return self._create_default_dynamic_config()
     
+    def _get_file_key(self) -> Tuple[int, int]:
+        """以修改時間與大小識別動態配置檔案版本"""
+        stat = os.stat(self.dynamic_config_path)
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _write_dynamic_config(self, config: Dict):
+        """寫入動態配置檔案並同步更新快取（先寫暫存檔再原子替換，避免中斷時留下不完整檔案）"""
+        os.makedirs(os.path.dirname(self.dynamic_config_path), exist_ok=True)
+        tmp_path = self.dynamic_config_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.dynamic_config_path)
+        except Exception:
+            # 寫入失敗時移除暫存檔，避免殘留在config目錄
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._dynamic_config_cache = (self._get_file_key(), config)
+    
     def _merge_configurations(self, base: Dict[str, List[str]], dynamic: Dict) -> Dict[str, List[str]]:
         """合併基礎預測和動態更新"""
         final_schedule = base.copy()
+        overrides = dynamic.get('overrides', {})
+        today = date.today()
         
         # 1. 應用確認的日期覆蓋（最高優先級）
         overrides_applied = 0
-        for etf_code, override_data in dynamic.get('overrides', {}).items():
+        for etf_code, override_data in overrides.items():
             if isinstance(override_data, dict) and 'confirmed_dates' in override_data:
                 confirmed_dates = override_data['confirmed_dates']
-                # 只保留未來日期
-                future_dates = [
+                # 只保留未來日期（以set去除重複日期）
+                future_dates = {
                     d for d in confirmed_dates 
-                    if datetime.strptime(d, '%Y-%m-%d').date() > date.today()
-                ]
+                    if date.fromisoformat(d) > today
+                }
                 if future_dates:
                     final_schedule[etf_code] = sorted(future_dates)
                     overrides_applied += 1
@@ -160,13 +191,13 @@ class DividendConfigManager:
         # 2. 應用動態預測（如果沒有確認日期）
         predictions_applied = 0
         for etf_code, prediction_data in dynamic.get('predictions', {}).items():
-            if etf_code not in dynamic.get('overrides', {}) and isinstance(prediction_data, dict):
+            if etf_code not in overrides and isinstance(prediction_data, dict):
                 if 'estimated_dates' in prediction_data:
                     estimated_dates = prediction_data['estimated_dates']
-                    future_dates = [
+                    future_dates = {
                         d for d in estimated_dates 
-                        if datetime.strptime(d, '%Y-%m-%d').date() > date.today()
-                    ]
+                        if date.fromisoformat(d) > today
+                    }
                     if future_dates:
                         final_schedule[etf_code] = sorted(future_dates)
                         predictions_applied += 1
@@ -199,10 +230,13 @@ class DividendConfigManager:
             if 'overrides' not in dynamic_config:
                 dynamic_config['overrides'] = {}
             
+            # 同一次更新的所有時間戳記使用同一時間
+            now_iso = datetime.now().isoformat()
+            
             dynamic_config['overrides'][etf_code] = {
                 'confirmed_dates': new_dates,
                 'source': source,
-                'updated_at': datetime.now().isoformat(),
+                'updated_at': now_iso,
                 'confidence': 'high' if source in ['official_announcement', 'api_verified'] else 'medium'
             }
             
@@ -211,7 +245,7 @@ class DividendConfigManager:
                 dynamic_config['manual_updates_log'] = []
             
             log_entry = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'action': 'update_confirmed_dates',
                 'etf_code': etf_code,
                 'new_dates': new_dates,
@@ -221,12 +255,11 @@ class DividendConfigManager:
             dynamic_config['manual_updates_log'].append(log_entry)
             
             # 更新元資料
-            dynamic_config['last_updated'] = datetime.now().isoformat()
-            dynamic_config['metadata']['last_manual_update'] = datetime.now().isoformat()
+            dynamic_config['last_updated'] = now_iso
+            dynamic_config['metadata']['last_manual_update'] = now_iso
             
             # 儲存配置
-            with open(self.dynamic_config_path, 'w', encoding='utf-8') as f:
-                json.dump(dynamic_config, f, indent=2, ensure_ascii=False)
+            self._write_dynamic_config(dynamic_config)
             
             print(f"   ✅ {etf_code} 除息日期更新成功")
             
@@ -237,6 +270,8 @@ class DividendConfigManager:
             
         except Exception as e:
             print(f"   ❌ 更新失敗 {etf_code}: {e}")
+            # 快取中的配置可能已被修改但未寫入，強制下次重新讀取
+            self._dynamic_config_cache = None
             return False
     
     def get_config_status(self) -> Dict[str, Any]:
@@ -326,9 +361,7 @@ class DividendConfigManager:
         
         # 嘗試儲存預設配置
         try:
-            os.makedirs(os.path.dirname(self.dynamic_config_path), exist_ok=True)
-            with open(self.dynamic_config_path, 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, indent=2, ensure_ascii=False)
+            self._write_dynamic_config(default_config)
             print("   ✅ 預設動態配置已創建")
         except Exception as e:
             print(f"   ❌ 創建預設配置失敗: {e}")
@@ -368,7 +401,7 @@ class DividendConfigManager:
         for etf_code, dates in emergency_config.items():
             future_dates = [
                 d for d in dates 
-                if datetime.strptime(d, '%Y-%m-%d').date() > today
+                if date.fromisoformat(d) > today
             ]
             filtered_config[etf_code] = future_dates
             print(f"   🆘 {etf_code}: {len(future_dates)} 個緊急日期")
@@ -378,11 +411,13 @@ class DividendConfigManager:
     def _backup_to_firebase(self, config_data: Dict):
         """備份配置到Firebase（可選）"""
         try:
-            # 嘗試導入Firebase客戶端
-            firebase_path = os.path.join(os.path.dirname(self.current_dir), "core", "firebase_client.py")
+            # 嘗試導入Firebase客戶端（以core套件導入，支援套件內相對導入）
+            scripts_dir = os.path.dirname(self.current_dir)
+            firebase_path = os.path.join(scripts_dir, "core", "firebase_client.py")
             if os.path.exists(firebase_path):
-                sys.path.insert(0, os.path.dirname(firebase_path))
-                from firebase_client import FirebaseClient
+                if scripts_dir not in sys.path:
+                    sys.path.insert(0, scripts_dir)
+                from core.firebase_client import FirebaseClient
                 
                 firebase_client = FirebaseClient()
                 success = firebase_client.save("dividend_config/latest", config_data)
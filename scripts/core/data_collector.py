@@ -1,64 +1,177 @@
 """數據收集器"""
 
-import requests
 import pandas as pd
+import json
+import os
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional
 from .etf_data_parser import ETFDataParser
+from .http_session import create_session
+
+try:
+    import orjson  # 可選依賴：較快的JSON讀寫
+except ImportError:
+    orjson = None
 
 class ETFDataCollector:
     """ETF數據收集器"""
     
-    def __init__(self):
+    # 月份結束超過此天數後視為資料已定案，可快取於本機
+    CACHE_SETTLE_DAYS = 7
+    # 同時對TWSE發出的最大請求數
+    MAX_CONCURRENT_REQUESTS = 3
+    # 兩次TWSE請求發出的最小間隔秒數（所有執行緒共用，整體速率上限每秒1次）
+    MIN_REQUEST_INTERVAL = 1.0
+    
+    def __init__(self, cache_dir: Optional[str] = None):
         self.base_url = "https://www.twse.com.tw/exchangeReport/STOCK_DAY"
         self.parser = ETFDataParser()
+        self.session = create_session(pool_maxsize=self.MAX_CONCURRENT_REQUESTS)
+        self.cache_dir = cache_dir or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "twse"
+        )
+        self._request_slots = threading.BoundedSemaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
     
     def get_monthly_data(self, etf_code: str, year_month: str) -> Optional[pd.DataFrame]:
-        """獲取ETF月份資料"""
+        """獲取ETF月份資料（已定案的月份優先使用本機快取）"""
         url = f"{self.base_url}?response=json&date={year_month}01&stockNo={etf_code}"
+        cache_path = os.path.join(self.cache_dir, f"{etf_code}_{year_month}.json")
         
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                return None
+            data = self._load_cached_month(cache_path)
+            
+            if data is None:
+                with self._request_slots:
+                    self._wait_for_rate_limit()
+                    response = self.session.get(url, timeout=10)
+                if response.status_code != 200:
+                    return None
+                
+                # 直接解析原始位元組，略過 response.text 的解碼複製
+                data = self._decode_json(response.content)
+                if data.get('stat') != 'OK' or not data.get('data'):
+                    return None
                 
-            data = response.json()
-            if data.get('stat') != 'OK' or not data.get('data'):
-                return None
+                if self._is_settled_month(year_month):
+                    self._save_cached_month(cache_path, data)
             
             return self.parser.parse_raw_data(data)
-            
+        
         except Exception as e:
             print(f"❌ 獲取 {etf_code} 資料失敗: {e}")
             return None
     
+    def _wait_for_rate_limit(self):
+        """兩次TWSE請求之間至少間隔 MIN_REQUEST_INTERVAL 秒（於鎖內預約發送時間，鎖外等待）"""
+        with self._rate_lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_request_time)
+            self._next_request_time = scheduled + self.MIN_REQUEST_INTERVAL
+        
+        if scheduled > now:
+            time.sleep(scheduled - now)
+    
+    def _is_settled_month(self, year_month: str) -> bool:
+        """判斷月份資料是否已定案（月底已超過 CACHE_SETTLE_DAYS 天）"""
+        year, month = int(year_month[:4]), int(year_month[4:6])
+        next_month_start = date(year + month // 12, month % 12 + 1, 1)
+        return date.today() - timedelta(days=self.CACHE_SETTLE_DAYS) >= next_month_start
+    
+    @staticmethod
+    def _decode_json(content: bytes) -> Dict:
+        """解析JSON位元組（優先使用orjson，未安裝時退回標準json）"""
+        return orjson.loads(content) if orjson is not None else json.loads(content)
+    
+    def _load_cached_month(self, cache_path: str) -> Optional[Dict]:
+        """讀取本機快取的月份原始資料"""
+        if not os.path.exists(cache_path):
+            return None
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                return self._decode_json(f.read())
+        except Exception as e:
+            print(f"⚠️ 快取讀取失敗，重新下載: {e}")
+            return None
+    
+    def _save_cached_month(self, cache_path: str, data: Dict):
+        """將已定案的月份原始資料寫入本機快取"""
+        tmp_path = cache_path + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if orjson is not None:
+                content = orjson.dumps(data)
+            else:
+                content = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"⚠️ 快取寫入失敗: {e}")
+            # 移除寫到一半的暫存檔
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
     def get_historical_data(self, etf_code: str, months: int = 6) -> Optional[pd.DataFrame]:
-        """獲取歷史資料"""
-        all_data = []
-        current_date = datetime.now()
+        """獲取歷史資料（各月份並行下載，同時請求數受 MAX_CONCURRENT_REQUESTS 限制）"""
+        year_months = self._get_year_months(months)
         
-        for i in range(months):
-            year_month = (current_date - timedelta(days=30*i)).strftime('%Y%m')
-            monthly_data = self.get_monthly_data(etf_code, year_month)
-            
-            if monthly_data is not None:
-                all_data.append(monthly_data)
-            
-            time.sleep(1)  # 避免請求過快
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+            monthly_results = executor.map(
+                lambda year_month: self.get_monthly_data(etf_code, year_month), year_months
+            )
+            all_data = [data for data in monthly_results if data is not None]
         
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
-            return combined_df.drop_duplicates().sort_values('date').reset_index(drop=True)
+            # 以日期為主鍵去重，只需雜湊單一欄位而非整列
+            return (
+                combined_df.drop_duplicates(subset='date', keep='last')
+                .sort_values('date', kind='stable')
+                .reset_index(drop=True)
+            )
         
         return None
     
+    def _get_year_months(self, months: int) -> List[str]:
+        """計算需要抓取的月份清單（由本月往前逐月回推）
+        
+        STOCK_DAY 端點只接受單一月份查詢，沒有區間參數，
+        因此以不重複的月份清單確保每個月份只請求一次。
+        以年月直接回推，避免「每月30天」近似造成月份重複或遺漏。
+        """
+        current_date = datetime.now()
+        year, month = current_date.year, current_date.month
+        year_months = []
+        
+        for _ in range(months):
+            year_months.append(f"{year}{month:02d}")
+            month -= 1
+            if month == 0:
+                year, month = year - 1, 12
+        
+        return year_months
+    
     def collect_all_etfs(self, etf_list: List[str]) -> Dict[str, Optional[pd.DataFrame]]:
-        """收集所有ETF資料"""
+        """收集所有ETF資料（各ETF並行收集，TWSE同時請求數仍受 MAX_CONCURRENT_REQUESTS 限制）"""
         results = {}
         
-        for etf in etf_list:
-            print(f"📊 收集 {etf} 資料...")
-            results[etf] = self.get_historical_data(etf)
+        with ThreadPoolExecutor(max_workers=max(len(etf_list), 1)) as executor:
+            futures = {}
+            for etf in etf_list:
+                print(f"📊 收集 {etf} 資料...")
+                futures[etf] = executor.submit(self.get_historical_data, etf)
+            
+            for etf, future in futures.items():
+                try:
+                    results[etf] = future.result()
+                except Exception as e:
+                    print(f"❌ 收集 {etf} 資料失敗: {e}")
+                    results[etf] = None
         
         return results
@@ -1,14 +1,28 @@
 """ETF數據解析器"""
 
+import hashlib
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class ETFDataParser:
     """ETF數據解析器"""
     
+    # TWSE數值欄位對應（固定不變，於類別層級定義一次）
+    COLUMN_MAPPING = {
+        '開盤價': 'open',
+        '最高價': 'high',
+        '最低價': 'low',
+        '收盤價': 'close',
+        '成交股數': 'volume',
+        '成交金額': 'amount'
+    }
+    # 輸出欄位順序
+    OUTPUT_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'amount']
+    
     @staticmethod
-    def convert_tw_date(date_str: str) -> str:
+    def convert_tw_date(date_str: str) -> Optional[str]:
         """轉換台灣民國年為西元年"""
         try:
             parts = date_str.split('/')
@@ -20,69 +34,88 @@ class ETFDataParser:
             return None
     
     def parse_raw_data(self, raw_data: Dict[str, Any]) -> pd.DataFrame:
-        """解析原始數據"""
-        df = pd.DataFrame(raw_data['data'], columns=raw_data['fields'])
-        
-        # 轉換日期
-        df['date'] = df['日期'].apply(self.convert_tw_date)
-        df['date'] = pd.to_datetime(df['date'])
+        """解析原始數據（逐欄直接建構，只轉換需要的欄位）"""
+        fields = raw_data['fields']
+        rows = raw_data['data']
+        raw_columns = dict(zip(fields, zip(*rows) if rows else [()] * len(fields)))
         
-        # 數值轉換
-        numeric_cols = ['成交股數', '成交金額', '開盤價', '最高價', '最低價', '收盤價']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = df[col].str.replace(',', '').astype(float)
-        
-        # 重新命名欄位
-        column_mapping = {
-            '開盤價': 'open',
-            '最高價': 'high', 
-            '最低價': 'low',
-            '收盤價': 'close',
-            '成交股數': 'volume',
-            '成交金額': 'amount'
-        }
+        # 轉換日期（向量化拆解民國年/月/日，無法解析的日期為NaT）
+        date_parts = (
+            pd.Series(raw_columns['日期'], dtype=object).str.split('/', n=2, expand=True)
+            .reindex(columns=range(3))
+            .apply(pd.to_numeric, errors='coerce')
+        )
+        dates = pd.to_datetime(
+            pd.DataFrame({
+                'year': date_parts[0] + 1911,
+                'month': date_parts[1],
+                'day': date_parts[2]
+            }),
+            errors='coerce'
+        )
         
-        df = df.rename(columns=column_mapping)
+        # 數值轉換（移除千分位逗號後直接轉為float陣列，不經過object DataFrame）
+        columns = {'date': dates}
+        for field, name in self.COLUMN_MAPPING.items():
+            columns[name] = np.array([value.replace(',', '') for value in raw_columns[field]], dtype=float)
         
         # 選擇需要的欄位
-        return df[['date', 'open', 'high', 'low', 'close', 'volume', 'amount']]
+        return pd.DataFrame(columns, columns=self.OUTPUT_COLUMNS)
     
     def convert_to_firebase_format(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
-        """轉換為Firebase格式"""
-        firebase_data = {}
+        """轉換為Firebase格式（逐欄取出陣列後以zip組裝，避免iterrows逐列裝箱）"""
+        updated_at = datetime.now().isoformat()
+        date_keys = df['date'].dt.strftime('%Y-%m-%d').tolist()
         
-        for _, row in df.iterrows():
-            date_key = row['date'].strftime('%Y-%m-%d')
-            firebase_data[date_key] = {
+        return {
+            date_key: {
                 'date': date_key,
-                'open': float(row['open']),
-                'high': float(row['high']),
-                'low': float(row['low']),
-                'close': float(row['close']),
-                'volume': int(row['volume']),
-                'amount': int(row['amount']),
-                'updated_at': datetime.now().isoformat()
+                'open': float(open_price),
+                'high': float(high),
+                'low': float(low),
+                'close': float(close),
+                'volume': int(volume),
+                'amount': int(amount),
+                'updated_at': updated_at
             }
+            for date_key, open_price, high, low, close, volume, amount in zip(
+                date_keys,
+                df['open'].tolist(),
+                df['high'].tolist(),
+                df['low'].tolist(),
+                df['close'].tolist(),
+                df['volume'].tolist(),
+                df['amount'].tolist()
+            )
+        }
+    
+    @staticmethod
+    def compute_data_hash(df: pd.DataFrame) -> str:
+        """計算歷史數據的內容雜湊（直接以欄位陣列計算，未變動時可略過Firebase格式轉換與上傳）
         
-        return firebase_data
+        數值正規化方式與 convert_to_firebase_format 相同：日期取到日、價格為float、量額為int
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(df['date'].to_numpy(dtype='datetime64[D]').astype(np.int64).tobytes())
+        for column in ('open', 'high', 'low', 'close'):
+            digest.update(df[column].to_numpy(dtype=np.float64).tobytes())
+        for column in ('volume', 'amount'):
+            digest.update(df[column].to_numpy(dtype=np.float64).astype(np.int64).tobytes())
+        return digest.hexdigest()
     
     def convert_from_firebase_format(self, firebase_data: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
-        """從Firebase格式轉換為DataFrame"""
+        """從Firebase格式轉換為DataFrame（逐欄建構，日期一次向量化解析）"""
         if not firebase_data:
             return pd.DataFrame()
         
-        data_list = []
-        for date_str, day_data in firebase_data.items():
-            data_list.append({
-                'date': pd.to_datetime(date_str),
-                'open': day_data.get('open'),
-                'high': day_data.get('high'),
-                'low': day_data.get('low'),
-                'close': day_data.get('close'),
-                'volume': day_data.get('volume', 0),
-                'amount': day_data.get('amount', 0)
-            })
-        
-        df = pd.DataFrame(data_list)
+        records = list(firebase_data.values())
+        df = pd.DataFrame({
+            'date': pd.to_datetime(list(firebase_data.keys())),
+            'open': [day_data.get('open') for day_data in records],
+            'high': [day_data.get('high') for day_data in records],
+            'low': [day_data.get('low') for day_data in records],
+            'close': [day_data.get('close') for day_data in records],
+            'volume': [day_data.get('volume', 0) for day_data in records],
+            'amount': [day_data.get('amount', 0) for day_data in records]
+        })
         return df.sort_values('date').reset_index(drop=True)
@@ -1,9 +1,41 @@
 """Firebase客戶端封裝"""
 
-import requests
 import json
+import math
 import os
+from datetime import date, datetime
 from typing import Dict, Any, Optional
+import numpy as np
+from .http_session import create_session
+
+try:
+    import orjson  # 可選依賴：較快的JSON序列化
+except ImportError:
+    orjson = None
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def _json_default(value: Any) -> Any:
+    """標準json無法處理的型別轉換（對應orjson支援的日期與numpy型別，其餘型別直接報錯）"""
+    if type(value) in (date, datetime):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def _replace_non_finite(value: Any) -> Any:
+    """將NaN/Infinity換成None（orjson將非有限浮點數寫為null）"""
+    if isinstance(value, dict):
+        return {key: _replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_non_finite(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _replace_non_finite(value.tolist())
+    if isinstance(value, (float, np.floating)) and not math.isfinite(value):
+        return None
+    return value
 
 class FirebaseClient:
     """Firebase操作客戶端"""
@@ -13,13 +45,36 @@ class FirebaseClient:
             'FIREBASE_URL', 
             'https://your-project-default-rtdb.asia-southeast1.firebasedatabase.app'
         )
+        # 重複使用TCP/TLS連線，避免每次請求重新握手
+        self.session = create_session()
+    
+    @staticmethod
+    def _serialize(data: Any) -> bytes:
+        """序列化上傳內容（優先使用orjson，未安裝時以標準json產生相同的緊湊輸出）"""
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        dumps_options = dict(ensure_ascii=False, separators=(',', ':'), default=_json_default, allow_nan=False)
+        try:
+            text = json.dumps(data, **dumps_options)
+        except ValueError:
+            # 含NaN/Infinity時先換成null再序列化（僅在需要時才走訪整個內容）
+            text = json.dumps(_replace_non_finite(data), **dumps_options)
+        return text.encode('utf-8')
+    
+    @staticmethod
+    def _deserialize(content: bytes) -> Any:
+        """解析回應內容（優先使用orjson，未安裝時退回標準json）"""
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
     
     def save(self, path: str, data: Dict[str, Any]) -> bool:
         """保存資料到Firebase"""
         url = f"{self.firebase_url}/{path}.json"
         
         try:
-            response = requests.put(url, json=data, timeout=10)
+            response = self.session.put(url, data=self._serialize(data),
+                                        headers=JSON_HEADERS, timeout=10)
             return response.status_code == 200
         except Exception as e:
             print(f"❌ Firebase保存失敗 {path}: {e}")
@@ -30,9 +85,9 @@ class FirebaseClient:
         url = f"{self.firebase_url}/{path}.json"
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             if response.status_code == 200:
-                return response.json()
+                return self._deserialize(response.content)
             return None
         except Exception as e:
             print(f"❌ Firebase讀取失敗 {path}: {e}")
@@ -43,8 +98,31 @@ class FirebaseClient:
         url = f"{self.firebase_url}/{path}.json"
         
         try:
-            response = requests.patch(url, json=data, timeout=10)
+            response = self.session.patch(url, data=self._serialize(data),
+                                          headers=JSON_HEADERS, timeout=10)
             return response.status_code == 200
         except Exception as e:
             print(f"❌ Firebase更新失敗 {path}: {e}")
             return False
+    
+    def save_multi(self, updates: Dict[str, Any]) -> bool:
+        """以單一請求寫入多個路徑（Firebase multi-path update）
+        
+        Args:
+            updates: {路徑: 資料}，每個路徑的內容會被完整覆蓋（等同各自 save）
+        
+        Returns:
+            bool: 所有路徑是否一次寫入成功（全部成功或全部失敗）
+        """
+        if not updates:
+            return True
+        
+        url = f"{self.firebase_url}/.json"
+        
+        try:
+            response = self.session.patch(url, data=self._serialize(updates),
+                                          headers=JSON_HEADERS, timeout=30)
+            return response.status_code == 200
+        except Exception as e:
+            print(f"❌ Firebase批次保存失敗 {list(updates)}: {e}")
+            return False
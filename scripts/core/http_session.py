@@ -0,0 +1,27 @@
+"""HTTP連線池工具"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def create_session(pool_maxsize: int = 8) -> requests.Session:
+    """建立共用連線的Session（keep-alive連線池 + 暫時性錯誤重試）
+    
+    Args:
+        pool_maxsize: 每個主機保留的最大連線數，應不小於並行請求數
+    
+    Returns:
+        requests.Session: 已掛載連線池與重試策略的Session
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+    return session
@@ -14,8 +14,9 @@ ETF策略主分析程式 - 簡化版（v2.0）
 
 import sys
 import os
+import traceback
 from datetime import datetime, date
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 # 確保路徑正確
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -29,6 +30,24 @@ from config.etf_config import get_dividend_schedule
 class SimplifiedETFAnalyzer:
     """簡化版ETF策略分析器"""
     
+    # 摘要統計欄位（顯示名稱, summary鍵）
+    SUMMARY_STATS = (
+        ('總機會數', 'total_opportunities'),
+        ('買進信號', 'buy_signals'),
+        ('賣出信號', 'sell_signals'),
+        ('高信心機會', 'high_confidence')
+    )
+    # 系統健康狀態對應圖示（未列出者視為 poor）
+    HEALTH_EMOJI = {'excellent': '🟢', 'good': '🟡', 'fair': '🟠'}
+    # 操作建議對應圖示（未列出者顯示 ❓）
+    ACTION_EMOJI = {
+        'STRONG_BUY': '🔥', 'BUY': '🟢', 'CAUTIOUS_BUY': '🟡',
+        'SELL_PREPARE': '🟠', 'HOLD': '⚪', 'MONITOR': '👀'
+    }
+    # 機會分類條件
+    BUY_ACTIONS = frozenset(('BUY', 'STRONG_BUY'))
+    HIGH_CONFIDENCE_LEVELS = frozenset(('high', 'very_high'))
+    
     def __init__(self):
         print("🚀 初始化簡化版ETF策略分析系統...")
         
@@ -43,7 +62,9 @@ class SimplifiedETFAnalyzer:
     def run_daily_analysis(self) -> Dict[str, Any]:
         """執行每日分析流程（簡化版）"""
         try:
-            print(f"\n🔄 開始執行每日分析流程 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            # 本次執行的時間基準（除息配置、最新價格、分析與錯誤報告的時間戳記共用）
+            self.run_started_at = datetime.now()
+            print(f"\n🔄 開始執行每日分析流程 - {self.run_started_at.strftime('%Y-%m-%d %H:%M:%S')}")
             
             # 1. 載入除息配置（使用新系統）
             print(f"\n📅 第1步：載入除息配置...")
@@ -51,11 +72,11 @@ class SimplifiedETFAnalyzer:
             
             # 2. 數據收集和更新
             print(f"\n📊 第2步：收集ETF數據...")
-            update_status = self._update_etf_data()
+            update_status, collected_data, known_prices = self._update_etf_data()
             
             # 3. 載入數據進行分析
             print(f"\n📈 第3步：載入分析數據...")
-            etf_data_dict = self._load_analysis_data()
+            etf_data_dict = self._load_analysis_data(collected_data)
             
             # 4. 尋找投資機會
             print(f"\n🎯 第4步：分析投資機會...")
@@ -63,7 +84,7 @@ class SimplifiedETFAnalyzer:
             
             # 5. 獲取最新價格
             print(f"\n💰 第5步：更新價格資訊...")
-            latest_prices = self._get_latest_prices()
+            latest_prices = self._get_latest_prices(known_prices)
             
             # 6. 生成分析報告
             print(f"\n📋 第6步：生成分析報告...")
@@ -84,7 +105,6 @@ class SimplifiedETFAnalyzer:
             
         except Exception as e:
             print(f"\n💥 分析流程執行失敗: {e}")
-            import traceback
             traceback.print_exc()
             
             # 返回錯誤報告
@@ -103,12 +123,12 @@ class SimplifiedETFAnalyzer:
             print(f"📅 總計 {total_dates} 個未來除息日期")
             
             # 顯示近期除息日期
-            today = date.today()
+            today = self.run_started_at.date()
             for etf_code, dates in dividend_schedule.items():
                 if dates:
                     next_date = dates[0]
                     try:
-                        next_date_obj = datetime.strptime(next_date, '%Y-%m-%d').date()
+                        next_date_obj = date.fromisoformat(next_date)
                         days_until = (next_date_obj - today).days
                         print(f"📅 {etf_code}: {next_date} ({days_until}天後)")
                     except:
@@ -120,7 +140,7 @@ class SimplifiedETFAnalyzer:
                 'total_etfs': len(dividend_schedule),
                 'total_dates': total_dates,
                 'source': 'integrated_config_system',
-                'last_updated': datetime.now().isoformat()
+                'last_updated': self.run_started_at.isoformat()
             }
             
         except Exception as e:
@@ -130,53 +150,76 @@ class SimplifiedETFAnalyzer:
                 'error': str(e),
                 'schedule': {},
                 'source': 'error',
-                'last_updated': datetime.now().isoformat()
+                'last_updated': self.run_started_at.isoformat()
             }
     
-    def _update_etf_data(self) -> Dict[str, bool]:
-        """更新ETF數據（簡化版）"""
-        update_status = {}
+    def _update_etf_data(self) -> Tuple[Dict[str, bool], Dict[str, Any], Dict[str, Any]]:
+        """更新ETF數據（簡化版，所有Firebase寫入合併為單一批次請求）
+        
+        Returns:
+            (各ETF更新狀態, 本次收集的歷史數據, 本次成功寫入的最新價格)
+        """
+        update_status = dict.fromkeys(ETF_LIST, False)
+        pending_writes = {}
+        data_points = {}
+        latest_infos = {}
         
         print(f"📊 開始更新ETF數據...")
         
+        # 讀取上次寫入的內容雜湊（存於 etf_data_meta，不放在查詢用的 latest_prices），歷史數據未變動時不重複上傳
+        previous_meta = self.firebase_client.get("etf_data_meta") or {}
+        last_updated = self.run_started_at.isoformat()
+        
+        # 收集歷史數據（所有ETF並行下載）
+        all_historical_data = self.data_collector.collect_all_etfs(ETF_LIST)
+        
         for etf in ETF_LIST:
             print(f"  📈 更新 {etf} 數據...")
             
             try:
-                # 收集歷史數據
-                historical_data = self.data_collector.get_historical_data(etf)
+                historical_data = all_historical_data.get(etf)
                 
                 if historical_data is not None and len(historical_data) > 0:
-                    # 轉換為Firebase格式
-                    firebase_data = self.data_parser.convert_to_firebase_format(historical_data)
+                    data_hash = self.data_parser.compute_data_hash(historical_data)
                     
-                    # 保存到Firebase
-                    success = self.firebase_client.save(f"etf_data/{etf}", firebase_data)
+                    # 最新價格（直接取欄位末值，不建立整列Series）
+                    latest_info = {
+                        'latest_price': float(historical_data['close'].iat[-1]),
+                        'latest_date': historical_data['date'].iat[-1].strftime('%Y-%m-%d'),
+                        'last_updated': last_updated,
+                        'data_source': 'twse_api',
+                        'data_points': len(historical_data)
+                    }
                     
-                    if success:
-                        # 更新最新價格
-                        latest_row = historical_data.iloc[-1]
-                        latest_info = {
-                            'latest_price': float(latest_row['close']),
-                            'latest_date': latest_row['date'].strftime('%Y-%m-%d'),
-                            'last_updated': datetime.now().isoformat(),
-                            'data_source': 'twse_api',
-                            'data_points': len(historical_data)
-                        }
-                        self.firebase_client.save(f"latest_prices/{etf}", latest_info)
-                        
-                        update_status[etf] = True
-                        print(f"    ✅ {etf}: 成功更新 {len(historical_data)} 筆數據")
+                    previous_info = previous_meta.get(etf)
+                    if isinstance(previous_info, dict) and previous_info.get('data_hash') == data_hash:
+                        print(f"    ⏭️ {etf}: 歷史數據未變動，略過上傳")
                     else:
-                        update_status[etf] = False
-                        print(f"    ❌ {etf}: Firebase保存失敗")
+                        # 僅在內容變動時轉換為Firebase格式，雜湊與數據同批寫入
+                        pending_writes[f"etf_data/{etf}"] = self.data_parser.convert_to_firebase_format(historical_data)
+                        pending_writes[f"etf_data_meta/{etf}"] = {'data_hash': data_hash}
+                    pending_writes[f"latest_prices/{etf}"] = latest_info
+                    latest_infos[etf] = latest_info
+                    data_points[etf] = len(historical_data)
                 else:
-                    update_status[etf] = False
                     print(f"    ❌ {etf}: 數據收集失敗或無數據")
-                    
+            
             except Exception as e:
                 print(f"    ❌ {etf}: 更新錯誤 - {e}")
-                update_status[etf] = False
+        
+        # 保存到Firebase（etf_data、etf_data_meta 與 latest_prices 一次寫入）
+        known_prices = {}
+        if pending_writes:
+            success = self.firebase_client.save_multi(pending_writes)
+            if success:
+                known_prices.update(latest_infos)
+            
+            for etf, count in data_points.items():
+                update_status[etf] = success
+                if success:
+                    print(f"    ✅ {etf}: 成功更新 {count} 筆數據")
+                else:
+                    print(f"    ❌ {etf}: Firebase保存失敗")
         
         # 統計結果
         success_count = sum(update_status.values())
@@ -185,20 +228,31 @@ class SimplifiedETFAnalyzer:
         
         print(f"📊 數據更新完成: {success_count}/{total_count} 成功 ({success_rate:.1%})")
         
-        return update_status
+        return update_status, all_historical_data, known_prices
     
-    def _load_analysis_data(self) -> Dict[str, Any]:
-        """載入分析數據"""
+    def _load_analysis_data(self, collected_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """載入分析數據（本次已收集的數據直接沿用，其餘一次讀取 etf_data 節點）"""
+        collected_data = collected_data or {}
         etf_data_dict = {}
         
         print(f"📈 開始載入分析數據...")
         
+        # 本次已收集的數據與剛寫入Firebase的內容相同，不需重新下載
         for etf in ETF_LIST:
+            etf_df = collected_data.get(etf)
+            if etf_df is not None and len(etf_df) > 0:
+                etf_data_dict[etf] = etf_df
+                print(f"  ✅ {etf}: 沿用本次收集數據 - {len(etf_df)} 筆數據")
+        
+        missing_etfs = [etf for etf in ETF_LIST if etf not in etf_data_dict]
+        all_etf_data = (self.firebase_client.get("etf_data") or {}) if missing_etfs else {}
+        
+        for etf in missing_etfs:
             print(f"  📊 載入 {etf} 分析數據...")
             
             try:
                 # 從Firebase載入數據
-                firebase_data = self.firebase_client.get(f"etf_data/{etf}")
+                firebase_data = all_etf_data.get(etf)
                 
                 if firebase_data:
                     # 轉換為DataFrame格式
@@ -217,21 +271,28 @@ class SimplifiedETFAnalyzer:
                 print(f"    ❌ {etf}: 載入錯誤 - {e}")
                 etf_data_dict[etf] = None
         
+        # 依ETF_LIST順序整理結果
+        etf_data_dict = {etf: etf_data_dict.get(etf) for etf in ETF_LIST}
+        
         # 統計結果
         successful_loads = sum(1 for data in etf_data_dict.values() if data is not None)
         print(f"📈 數據載入完成: {successful_loads}/{len(ETF_LIST)} 個ETF有可用數據")
         
         return etf_data_dict
     
-    def _get_latest_prices(self) -> Dict[str, Any]:
-        """獲取最新價格資訊"""
+    def _get_latest_prices(self, known_prices: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """獲取最新價格資訊（優先沿用本次更新後已知的內容，有缺漏時才一次讀取 latest_prices 節點）"""
         latest_prices = {}
         
         print(f"💰 獲取最新價格資訊...")
         
+        all_prices = known_prices or {}
+        if any(etf not in all_prices for etf in ETF_LIST):
+            all_prices = {**(self.firebase_client.get("latest_prices") or {}), **all_prices}
+        
         for etf in ETF_LIST:
             try:
-                price_data = self.firebase_client.get(f"latest_prices/{etf}")
+                price_data = all_prices.get(etf)
                 if price_data:
                     latest_prices[etf] = price_data
                     price = price_data.get('latest_price', 'N/A')
@@ -257,16 +318,22 @@ class SimplifiedETFAnalyzer:
     
     def _generate_analysis_report(self, opportunities, latest_prices, update_status, dividend_config) -> Dict[str, Any]:
         """生成分析報告"""
-        
-        # 分析投資機會
-        buy_signals = [o for o in opportunities 
-                      if o.get('final_recommendation', {}).get('action') in ['BUY', 'STRONG_BUY']]
-        
-        sell_signals = [o for o in opportunities 
-                       if o.get('final_recommendation', {}).get('action') == 'SELL_PREPARE']
-        
-        high_confidence = [o for o in opportunities 
-                          if o.get('enhanced_confidence') in ['high', 'very_high']]
+        # 報告時間使用本次執行的時間基準，timestamp 與 analysis_date 保持一致
+        now = self.run_started_at
+        today = now.date()
+        
+        # 分析投資機會（單次走訪完成分類）
+        buy_signals = []
+        sell_signals = []
+        high_confidence_count = 0
+        for o in opportunities:
+            action = o.get('final_recommendation', {}).get('action')
+            if action in self.BUY_ACTIONS:
+                buy_signals.append(o)
+            elif action == 'SELL_PREPARE':
+                sell_signals.append(o)
+            if o.get('enhanced_confidence') in self.HIGH_CONFIDENCE_LEVELS:
+                high_confidence_count += 1
         
         # 計算系統健康度
         data_success_rate = sum(update_status.values()) / len(update_status) if update_status else 0
@@ -278,12 +345,11 @@ class SimplifiedETFAnalyzer:
                        'fair' if overall_health >= 0.5 else 'poor'
         
         # 計算數據新鮮度
-        today = date.today()
         fresh_data_count = 0
         for etf, price_data in latest_prices.items():
             if price_data.get('latest_date'):
                 try:
-                    data_date = datetime.strptime(price_data['latest_date'], '%Y-%m-%d').date()
+                    data_date = date.fromisoformat(price_data['latest_date'])
                     if (today - data_date).days <= 1:  # 1天內的數據視為新鮮
                         fresh_data_count += 1
                 except:
@@ -292,8 +358,9 @@ class SimplifiedETFAnalyzer:
         freshness_rate = fresh_data_count / len(latest_prices) if latest_prices else 0
         
         report = {
-            'timestamp': datetime.now().isoformat(),
-            'analysis_date': date.today().isoformat(),
+            'timestamp': now.isoformat(),
+            'analysis_date': today.isoformat(),
+            'analysis_time': now.strftime('%H:%M:%S'),
             'system_version': 'Simplified_v2.0_Stable',
             'opportunities': opportunities,
             'latest_prices': latest_prices,
@@ -309,7 +376,7 @@ class SimplifiedETFAnalyzer:
                 'total_opportunities': len(opportunities),
                 'buy_signals': len(buy_signals),
                 'sell_signals': len(sell_signals),
-                'high_confidence': len(high_confidence),
+                'high_confidence': high_confidence_count,
                 'data_freshness': {
                     'freshness_rate': freshness_rate,
                     'fresh_data_count': fresh_data_count,
@@ -352,21 +419,16 @@ class SimplifiedETFAnalyzer:
         return actions
     
     def _save_analysis_results(self, report: Dict[str, Any]) -> None:
-        """保存分析結果"""
+        """保存分析結果（每日報告與最新狀態以單一批次請求寫入）"""
         
         try:
-            # 保存每日分析報告
+            # 每日分析報告路徑
             daily_path = f"simplified_analysis/{report['analysis_date']}"
-            success = self.firebase_client.save(daily_path, report)
-            
-            if success:
-                print("  💾 每日報告已保存")
-            else:
-                print("  ⚠️ 每日報告保存失敗")
             
             # 更新最新狀態
             latest_status = {
                 'last_update': report['timestamp'],
+                'last_update_display': f"{report['analysis_date']} {report['analysis_time']}",
                 'opportunities': report['opportunities'],
                 'summary': report['summary'],
                 'system_health': report['system_health'],
@@ -375,23 +437,27 @@ class SimplifiedETFAnalyzer:
                 'system_version': 'Simplified_v2.0_Stable'
             }
             
-            success = self.firebase_client.save("latest_modular_status", latest_status)
+            success = self.firebase_client.save_multi({
+                daily_path: report,
+                "latest_modular_status": latest_status
+            })
             
             if success:
+                print("  💾 每日報告已保存")
                 print("  💾 最新狀態已更新")
+                print("  ✅ 分析結果已保存到Firebase")
             else:
-                print("  ⚠️ 最新狀態更新失敗")
-            
-            print("  ✅ 分析結果已保存到Firebase")
+                print("  ⚠️ 分析結果保存失敗")
             
         except Exception as e:
             print(f"  ❌ 保存分析結果失敗: {e}")
     
     def _generate_error_report(self, error_message: str) -> Dict[str, Any]:
         """生成錯誤報告"""
+        now = self.run_started_at
         return {
-            'timestamp': datetime.now().isoformat(),
-            'analysis_date': date.today().isoformat(),
+            'timestamp': now.isoformat(),
+            'analysis_date': now.date().isoformat(),
             'system_version': 'Simplified_v2.0_Stable',
             'status': 'error',
             'error_message': error_message,
@@ -411,103 +477,102 @@ class SimplifiedETFAnalyzer:
         }
     
     def _print_analysis_summary(self, report: Dict[str, Any]) -> None:
-        """顯示分析摘要"""
-        
-        print(f"\n" + "="*80)
-        print(f"🎯 ETF簡化版策略分析報告")
-        print(f"="*80)
-        print(f"📅 分析日期: {report['analysis_date']}")
-        print(f"⏰ 分析時間: {datetime.fromisoformat(report['timestamp']).strftime('%H:%M:%S')}")
-        print(f"🔧 系統版本: {report['system_version']}")
-        print(f"✨ 系統特色: 簡化穩定架構，整合配置系統")
+        """顯示分析摘要（先組合所有行，最後一次輸出）"""
+        lines = []
+        
+        lines.append(f"\n" + "="*80)
+        lines.append(f"🎯 ETF簡化版策略分析報告")
+        lines.append(f"="*80)
+        lines.append(f"📅 分析日期: {report['analysis_date']}")
+        analysis_time = report.get('analysis_time') or datetime.fromisoformat(report['timestamp']).strftime('%H:%M:%S')
+        lines.append(f"⏰ 分析時間: {analysis_time}")
+        lines.append(f"🔧 系統版本: {report['system_version']}")
+        lines.append(f"✨ 系統特色: 簡化穩定架構，整合配置系統")
         
         # 系統健康度
         health = report['system_health']
-        health_emoji = "🟢" if health['status'] == 'excellent' else \
-                      "🟡" if health['status'] == 'good' else \
-                      "🟠" if health['status'] == 'fair' else "🔴"
-        print(f"\n💊 系統健康度: {health_emoji} {health['status'].upper()} ({health['overall_score']:.1%})")
+        health_emoji = self.HEALTH_EMOJI.get(health['status'], '🔴')
+        lines.append(f"\n💊 系統健康度: {health_emoji} {health['status'].upper()} ({health['overall_score']:.1%})")
         
         # 除息配置狀態
         dividend_status = report['dividend_config_status']
         if dividend_status['success']:
-            print(f"📅 除息配置: ✅ 成功 ({dividend_status['total_dates']} 個日期)")
+            lines.append(f"📅 除息配置: ✅ 成功 ({dividend_status['total_dates']} 個日期)")
         else:
-            print(f"📅 除息配置: ❌ 失敗 - {dividend_status.get('error', 'Unknown')}")
+            lines.append(f"📅 除息配置: ❌ 失敗 - {dividend_status.get('error', 'Unknown')}")
         
         # 數據更新狀況
-        print(f"\n📊 數據更新狀況:")
+        lines.append(f"\n📊 數據更新狀況:")
         for etf, status in report['update_status'].items():
             emoji = "✅" if status else "❌"
-            print(f"  {emoji} {etf}: {'成功' if status else '失敗'}")
+            lines.append(f"  {emoji} {etf}: {'成功' if status else '失敗'}")
         
         # 最新價格
-        print(f"\n💰 最新價格:")
+        lines.append(f"\n💰 最新價格:")
         for etf, data in report['latest_prices'].items():
             if data.get('latest_price'):
                 price = data['latest_price']
                 date_str = data['latest_date']
-                print(f"  {etf}: ${price:.2f} ({date_str})")
+                lines.append(f"  {etf}: ${price:.2f} ({date_str})")
             else:
-                print(f"  {etf}: 資料載入中...")
+                lines.append(f"  {etf}: 資料載入中...")
         
         # 投資機會摘要
         opportunities = report['opportunities']
         if opportunities:
-            print(f"\n🎯 投資機會總覽 ({len(opportunities)}個):")
+            lines.append(f"\n🎯 投資機會總覽 ({len(opportunities)}個):")
             
+            empty = {}  # 缺少子項目時共用的預設值
             for i, opp in enumerate(opportunities, 1):
-                etf_code = opp.get('etf', '')
-                final_rec = opp.get('final_recommendation', {})
-                action = final_rec.get('action', opp.get('action', ''))
-                confidence = opp.get('enhanced_confidence', 'medium')
+                opp_get = opp.get
+                etf_code = opp_get('etf', '')
+                final_rec = opp_get('final_recommendation') or empty
+                action = final_rec.get('action', opp_get('action', ''))
+                confidence = opp_get('enhanced_confidence', 'medium')
                 
                 # 技術評分
-                tech_score = opp.get('technical_analysis', {}).get('score', 50)
+                tech_score = (opp_get('technical_analysis') or empty).get('score', 50)
                 
                 # 風險等級
-                risk_level = opp.get('risk_assessment', {}).get('risk_level', 'medium')
+                risk_level = (opp_get('risk_assessment') or empty).get('risk_level', 'medium')
                 
                 # 建議配置
-                allocation = opp.get('position_sizing', {}).get('suggested_allocation_pct', 0)
+                allocation = (opp_get('position_sizing') or empty).get('suggested_allocation_pct', 0)
                 
-                action_emoji = {
-                    'STRONG_BUY': '🔥', 'BUY': '🟢', 'CAUTIOUS_BUY': '🟡',
-                    'SELL_PREPARE': '🟠', 'HOLD': '⚪', 'MONITOR': '👀'
-                }.get(action, '❓')
+                action_emoji = self.ACTION_EMOJI.get(action, '❓')
                 
-                print(f"\n  {action_emoji} #{i} {etf_code} - {action}")
-                print(f"     信心度: {confidence} | 技術: {tech_score:.0f}/100")
-                print(f"     風險: {risk_level} | 建議配置: {allocation:.1f}%")
+                lines.append(f"\n  {action_emoji} #{i} {etf_code} - {action}")
+                lines.append(f"     信心度: {confidence} | 技術: {tech_score:.0f}/100")
+                lines.append(f"     風險: {risk_level} | 建議配置: {allocation:.1f}%")
                 
                 # 具體建議
-                reasoning = final_rec.get('reasoning', opp.get('reason', ''))
+                reasoning = final_rec.get('reasoning', opp_get('reason', ''))
                 if reasoning:
-                    print(f"     建議: {reasoning}")
+                    lines.append(f"     建議: {reasoning}")
         else:
-            print(f"\n😴 目前沒有投資機會")
+            lines.append(f"\n😴 目前沒有投資機會")
         
         # 下一步行動
-        print(f"\n🎯 下一步行動:")
+        lines.append(f"\n🎯 下一步行動:")
         for action in report['next_actions']:
-            print(f"  {action}")
+            lines.append(f"  {action}")
         
         # 系統統計
         summary = report['summary']
-        print(f"\n📈 系統統計:")
-        print(f"  總機會數: {summary['total_opportunities']}")
-        print(f"  買進信號: {summary['buy_signals']}")
-        print(f"  賣出信號: {summary['sell_signals']}")
-        print(f"  高信心機會: {summary['high_confidence']}")
+        lines.append(f"\n📈 系統統計:")
+        for label, key in self.SUMMARY_STATS:
+            lines.append(f"  {label}: {summary[key]}")
         
         freshness = summary.get('data_freshness', {})
         if freshness:
-            print(f"  數據新鮮度: {freshness['freshness_rate']:.1%}")
+            lines.append(f"  數據新鮮度: {freshness['freshness_rate']:.1%}")
+        
+        lines.append(f"\n" + "="*80)
+        lines.append(f"🎉 簡化版分析系統執行完成！")
+        lines.append(f"✨ 新特色：穩定配置系統，移除API依賴，專注核心分析")
+        lines.append(f"="*80)
         
-        print(f"\n" + "="*80)
-        print(f"🎉 簡化版分析系統執行完成！")
-        print(f"✨ 新特色：穩定配置系統，移除API依賴，專注核心分析")
-        print(f"="*80)
+        print("\n".join(lines))
 
 def main():
     """主函數"""
@@ -542,7 +607,6 @@ def main():
         
     except Exception as e:
         print(f"💥 主程式執行失敗: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -6,6 +6,20 @@ from config import POSITION_SIZING
 class SignalGenerator:
     """交易信號生成器"""
     
+    # 信心度對配置比例的調整倍數
+    CONFIDENCE_MULTIPLIERS = {
+        'very_high': 1.3,
+        'high': 1.1,
+        'medium': 1.0,
+        'low': 0.7
+    }
+    # 信心度分數映射
+    CONFIDENCE_SCORES = {'low': 25, 'medium': 50, 'high': 75, 'very_high': 90}
+    # 風險等級對信心分數的調整
+    RISK_ADJUSTMENTS = {
+        'very_low': 10, 'low': 5, 'medium': 0, 'high': -10, 'very_high': -20
+    }
+    
     def __init__(self):
         self.position_sizing = POSITION_SIZING
     
@@ -84,14 +98,7 @@ class SignalGenerator:
         base_allocation = self.position_sizing.get(f'{risk_level}_risk', 0.15)
         
         # 信心度調整
-        confidence_multipliers = {
-            'very_high': 1.3,
-            'high': 1.1,
-            'medium': 1.0,
-            'low': 0.7
-        }
-        
-        final_allocation = base_allocation * confidence_multipliers.get(confidence, 1.0)
+        final_allocation = base_allocation * self.CONFIDENCE_MULTIPLIERS.get(confidence, 1.0)
         final_allocation = min(final_allocation, self.position_sizing['max_single_position'])
         
         return {
@@ -110,8 +117,7 @@ class SignalGenerator:
         base_confidence = opportunity.get('confidence', 'medium')
         
         # 信心度分數映射
-        confidence_scores = {'low': 25, 'medium': 50, 'high': 75, 'very_high': 90}
-        base_score = confidence_scores.get(base_confidence, 50)
+        base_score = self.CONFIDENCE_SCORES.get(base_confidence, 50)
         
         # 技術分析調整
         if technical_score >= 80:
@@ -123,10 +129,7 @@ class SignalGenerator:
         
         # 風險調整
         risk_level = risk_assessment.get('risk_level', 'medium')
-        risk_adjustments = {
-            'very_low': 10, 'low': 5, 'medium': 0, 'high': -10, 'very_high': -20
-        }
-        base_score += risk_adjustments.get(risk_level, 0)
+        base_score += self.RISK_ADJUSTMENTS.get(risk_level, 0)
         
         # 轉換回信心等級
         final_score = max(0, min(100, base_score))